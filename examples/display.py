@@ -10,6 +10,7 @@ with ImageWindow(fullscreen=True, monitor=-1) as win:
     
     # Load all images in the current working directory recursively.
     # Alternatively, win.load() accepts a file name, dir name, PIL.Image, or pygame.Surface to make it easy to load images from a variety of sources.
+    # Pass preload=True to decode all image files up front (in parallel) so switching between images is instant.
     win.load('.', recursive=True)
     
     # Calling win.run() will start the internal event loop and block until the window is closed or the ESC key is pressed.
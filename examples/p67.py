@@ -12,21 +12,17 @@ out.mkdir(exist_ok=True)
 # Initialize PLM object pre-configured with .67 parameters
 plm = PLM.from_db('p67')
 
-# Read image file containing phase info encoded as 8-bit values and scale it between 0 and 2pi
-img = Image.open(here / 'dlp_logo_8bit.png')
-phase = np.asarray(img, dtype=float) / 255 * 2 * np.pi
-
-# PIL loads images with channel in last dimension slot, but we need it in the first
-# This only applies to RGB images (e.g. if separate phase patterns were encoded into each RGB channel)
-if len(phase.shape) > 2:
-    phase = np.moveaxis(phase, 2, 0)
+# Read image file containing phase info encoded as 8-bit values, where 0-255 maps to 0-2pi
+img = np.asarray(Image.open(here / 'dlp_logo_8bit.png'))
 
 # Process phase data into bitmap specific to the .67 PLM
 # This handles all quantization to appropriate phase displacement levels and mapping to the correct 2x2 electrode locations
-bmp = plm.process_phase_map(phase)
-
-if len(bmp.shape) > 2:
-    bmp = np.moveaxis(bmp, 0, 2)
+# PIL loads RGB images (e.g. if separate phase patterns were encoded into each RGB channel) with channel in last dimension slot
+# `channels_last` processes data in that layout directly, and returns the bitmap in the same layout so it can be saved with PIL
+# `process_phase_map_u8` works on the 8-bit values directly. This gives the same result as
+# `plm.process_phase_map(img / 255 * 2 * np.pi)`, but skips creating a floating point phase map and
+# looks up each pixel in a precomputed table, which is much faster
+bmp = plm.process_phase_map_u8(img, channels_last=img.ndim > 2)
 
 # Save to output directory
 Image.fromarray(bmp).save(out / 'dlp_logo_p67.png')
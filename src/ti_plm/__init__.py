@@ -3,13 +3,107 @@ This is the main module defining the PLM class. The PLM class leverages the 'par
 """
 
 from importlib.metadata import version
+from functools import lru_cache
 import param
 import numpy as np
-from .util import TIPLMException, TWO_PI, bitpack
+from .util import TIPLMException, TWO_PI, bitpack, _get_fastkernel
 
 __version__ = version(__package__ or __name__)
 
 
+@lru_cache(maxsize=8)
+def _build_phase_buckets(displacement_ratios, ratio_scale, phase_range):
+    """Calculate phase bucket array used by the quantize operation. See [ti_plm.PLM._update_phase_buckets][].
+
+    Args:
+        displacement_ratios (bytes): Raw float64 data of `displacement_ratios` array
+        ratio_scale (float): Scale factor applied to displacement ratios
+        phase_range (tuple): Min and max phase values
+
+    Returns:
+        ndarray: Read-only float32 array of phase bucket edges
+    """
+    displacement_ratios = np.frombuffer(displacement_ratios, dtype=np.float64)
+    
+    # scale displacements between phase_range min and max such that the full displacement range represents one less bit than the available bit depth
+    phase_disp = phase_range[0] + displacement_ratios * ratio_scale * (phase_range[-1] - phase_range[0])
+    phase_disp = np.hstack([phase_disp, phase_range[-1]])
+
+    # use average value of each phase level and the level above it to create buckets
+    # store as contiguous float32 to keep the quantize search small and cache friendly
+    buckets = np.ascontiguousarray((phase_disp[:-1] + phase_disp[1:]) / 2, dtype=np.float32)
+    buckets.flags.writeable = False  # result is shared between PLM objects
+    return buckets
+
+
+@lru_cache(maxsize=8)
+def _build_bit_luts(memory_lut, electrode_layout, electrode_layout_shape, data_flip):
+    """Calculate electrode bit lookup tables used by the electrode map operation. See [ti_plm.PLM._update_bit_lut][].
+    
+    Each entry of a table holds the bits written to the electrodes under one mirror for the corresponding phase state index.
+
+    Args:
+        memory_lut (bytes): Raw int64 data of `memory_lut` array
+        electrode_layout (bytes): Raw uint8 data of `electrode_layout` array
+        electrode_layout_shape (tuple): Shape of `electrode_layout` array
+        data_flip (tuple): 2-tuple of bools indicating whether to flip data along the row and column dimensions
+
+    Returns:
+        tuple: Read-only electrode bit table, same table with bits replicated across all 8 bits, and packed versions of both (see `_pack_bit_lut`)
+    """
+    memory_lut = np.frombuffer(memory_lut, dtype=np.int64)
+    electrode_layout = np.frombuffer(electrode_layout, dtype=np.uint8).reshape(electrode_layout_shape)
+    
+    # unpack each memory value into its individual bits (LSB first) using its little endian bytes, then pick out the bit under each electrode
+    # resulting array has shape (n_states, electrode rows, electrode columns)
+    bits = np.unpackbits(memory_lut.astype('<u8').view(np.uint8).reshape(-1, 8), axis=-1, bitorder='little')
+    bit_lut = np.ascontiguousarray(bits[:, electrode_layout])
+    
+    # same table with bits replicated across all 8 bits (0b11111111) for use by `process_phase_map`
+    bit_lut_x255 = bit_lut * np.uint8(255)
+    
+    luts = (bit_lut, bit_lut_x255, _pack_bit_lut(bit_lut, data_flip), _pack_bit_lut(bit_lut_x255, data_flip))
+    for lut in luts:
+        lut.flags.writeable = False  # results are shared between PLM objects
+    return luts
+
+
+@lru_cache(maxsize=32)
+def _deserialize_db_params(cls, catalog):
+    """Deserialize param values of a device in the database. See [ti_plm.PLM.from_db][].
+
+    Args:
+        cls (type): PLM class (or subclass) used to deserialize the json string
+        catalog (str): Device identifier in database
+
+    Returns:
+        dict: Param values. Arrays are read-only because the result is shared between PLM objects.
+    """
+    from .db import get_db
+    params = cls.param.deserialize_parameters(get_db()[catalog])
+    for value in params.values():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return params
+
+
+def _pack_bit_lut(bit_lut, data_flip):
+    """Rearrange an electrode bit lookup table so `electrode_map` can gather directly into the final output layout.
+    
+    Flipping the output along a dimension is the same as flipping each electrode block and reversing the order of the blocks along that dimension.
+    The first part is baked in here by flipping the electrode blocks of the table. `electrode_map` handles the second part by reversing the phase state index array.
+    The table is reordered to (electrode rows, n_states, electrode columns) so each row of an electrode block can be gathered into its final position in the output.
+    Each row is then packed into a single machine word (e.g. uint16 for a 2x2 layout) so the gather stores one word per phase pixel instead of one byte per electrode.
+    Viewing the bytes in memory order keeps this independent of platform endianness. Rows that don't fit a word are left as bytes.
+    Packing the whole block into one word (e.g. uint32 for 2x2) would make it a single gather, but the gathered blocks then need a transposing copy into (row, electrode row, column, electrode column) order, which costs several times more than the extra per-row gather.
+    """
+    bit_lut = np.flip(bit_lut, [1 + idx for idx, flip in enumerate(data_flip) if flip])
+    bit_lut = np.ascontiguousarray(np.swapaxes(bit_lut, 0, 1))
+    if bit_lut.shape[-1] in (1, 2, 4, 8):
+        bit_lut = bit_lut.view(f'u{bit_lut.shape[-1]}')
+    return bit_lut
+
+
 class PLM(param.Parameterized):
     """Base class defining intrinsic properties of a PLM device."""
     
@@ -62,16 +156,22 @@ class PLM(param.Parameterized):
     
     def __init__(self, **params):
         
-        # init cache of phase buckets and number of bits
+        # init cache of phase buckets, number of bits, and electrode bit lookup tables
         self._phase_buckets = None
         self._n_bits = 0
+        self._idx_dtype = np.uint8
+        self._bit_lut = None
+        self._bit_lut_x255 = None
+        self._bit_lut_packed = None
+        self._bit_lut_x255_packed = None
+        self._u8_state_lut = None
+        self._u8_bit_lut = None
+        self._u8_bit_lut_x255 = None
+        self._u8_bit_lut_packed = None
+        self._u8_bit_lut_x255_packed = None
         
         # init parent class
         super().__init__(**params)
-        
-        # ensure electrode_layout is exactly 2D
-        if len(self.electrode_layout.shape) != 2:
-            raise TIPLMException('`electrode_layout` must be 2D')
     
     @param.output(param.Number(label='Size (m)', doc='Active array dimensions (height, width) in meters'))
     @param.depends('shape', 'pitch')
@@ -100,77 +200,257 @@ class PLM(param.Parameterized):
         # otherwise, scale to the number of states minus one (e.g. 15/16 for 4-bit devices)
         ratio_scale = self.max_displacement_ratio if self.max_displacement_ratio is not None else (self._n_bits - 1) / self._n_bits
         
-        # scale displacements between phase_range min and max such that the full displacement range represents one less bit than the available bit depth
-        phase_disp = self.phase_range[0] + self.displacement_ratios * ratio_scale * (self.phase_range[-1] - self.phase_range[0])
-        phase_disp = np.hstack([phase_disp, self.phase_range[-1]])
-
-        # use average value of each phase level and the level above it to create buckets
-        self._phase_buckets = (phase_disp[:-1] + phase_disp[1:]) / 2
+        # pass array contents as bytes so the (memoized) calculation can be shared between PLM objects with the same parameters
+        self._phase_buckets = _build_phase_buckets(
+            np.asarray(self.displacement_ratios, dtype=np.float64).tobytes(),
+            ratio_scale,
+            tuple(self.phase_range)
+        )
+        
+        # smallest unsigned integer type that can hold every bucket index (including the wrap-around index n_bits)
+        self._idx_dtype = np.min_scalar_type(self._n_bits)
+        self._update_u8_lut()
+    
+    @param.depends('memory_lut', 'electrode_layout', 'data_flip', watch=True, on_init=True)
+    def _update_bit_lut(self):
+        """Cache the electrode bit lookup tables for use in the electrode map operation.
+        
+        This function will be run automatically any time any of the @param.depends decorator parameters are updated.
+        """
+        
+        # ensure electrode_layout is exactly 2D before building the lookup tables from it
+        if len(self.electrode_layout.shape) != 2:
+            raise TIPLMException('`electrode_layout` must be 2D')
+        
+        # memory_lut is only needed for electrode mapping, so a PLM without one can still be used to quantize phase data
+        if self.memory_lut is None or len(self.memory_lut) == 0:
+            self._bit_lut = self._bit_lut_x255 = self._bit_lut_packed = self._bit_lut_x255_packed = None
+            self._update_u8_lut()
+            return
+        
+        # memory values are bit fields, so they can't be floating point (which would be silently truncated when building the tables)
+        if not np.issubdtype(self.memory_lut.dtype, np.integer):
+            raise TIPLMException(f'`memory_lut` must be an integer array, got dtype {self.memory_lut.dtype}')
+        
+        # pass array contents as bytes so the (memoized) calculation can be shared between PLM objects with the same parameters
+        electrode_layout = np.asarray(self.electrode_layout, dtype=np.uint8)
+        self._bit_lut, self._bit_lut_x255, self._bit_lut_packed, self._bit_lut_x255_packed = _build_bit_luts(
+            np.asarray(self.memory_lut, dtype=np.int64).tobytes(),
+            electrode_layout.tobytes(),
+            electrode_layout.shape,
+            tuple(bool(flip) for flip in self.data_flip)
+        )
+        self._update_u8_lut()
+    
+    def _update_u8_lut(self):
+        """Cache the lookup tables for processing 8-bit encoded phase data, see `process_phase_map_u8`.
+        
+        These tables depend on both the phase buckets and the electrode bit lookup tables, so this function is called at the end of both cache update functions. Each table is only built once the caches it depends on are available.
+        """
+        
+        if self._phase_buckets is None:
+            return
+        
+        # there are only 256 possible input values, so quantize each of them once up front using the same float32 search as `quantize`
+        phase = self.phase_range[0] + np.arange(256) / 255 * (self.phase_range[1] - self.phase_range[0])
+        state = np.searchsorted(self._phase_buckets, phase.astype(np.float32), side='right') % self._n_bits
+        self._u8_state_lut = state.astype(self._idx_dtype)
+        
+        if self._bit_lut is None:
+            self._u8_bit_lut = self._u8_bit_lut_x255 = self._u8_bit_lut_packed = self._u8_bit_lut_x255_packed = None
+            return
+        
+        # fold the phase state lookup into the electrode bit lookup tables, so 8-bit values index the electrode bits directly
+        self._u8_bit_lut = np.take(self._bit_lut, state, axis=0)
+        self._u8_bit_lut_x255 = np.take(self._bit_lut_x255, state, axis=0)
+        self._u8_bit_lut_packed = np.take(self._bit_lut_packed, state, axis=1)
+        self._u8_bit_lut_x255_packed = np.take(self._bit_lut_x255_packed, state, axis=1)
     
     def quantize(self, phase_map):
         """Quantize phase data into a fixed number of phase states based on this device's displacement table
 
         Args:
-            phase_map (ndarray): Phase data in floating point format. Data range should match that of `phase_range` param.
+            phase_map (ndarray): Phase data in floating point format. Data range should match that of `phase_range` param. Data is converted to float32 before quantization, so float64 input is automatically downcast (float32 precision is well beyond the spacing of the available phase states). Passing float32 data avoids this conversion.
 
         Returns:
             ndarray: Array containing phase state index values corresponding to each input phase value. Range of outputs will be [0 n_states] where n_states is determined by the number of phase states the current device supports.
         """
-        phase_state_idx = np.digitize(phase_map, self._phase_buckets) % self._n_bits
+        # 16 phase states (4-bit devices) is the common case, use branchless compiled search if numba is available
+        fastkernel = _get_fastkernel()
+        if fastkernel is not None and self._n_bits == 16:
+            return fastkernel.quantize16(phase_map, self._phase_buckets)
+        
+        # work in float32 to halve memory traffic versus float64 (no copy if input is already C-contiguous float32)
+        phase_map = np.asarray(phase_map, dtype=np.float32, order='C')
+        
+        # binary search of each phase value into the sorted bucket array. side='right' matches the bucket edge convention of np.digitize.
+        phase_state_idx = np.searchsorted(self._phase_buckets, phase_map, side='right').astype(self._idx_dtype, copy=False)
+        
+        # wrap top bucket back to phase state 0 (e.g. 2pi --> 0) in place on the narrow index array
+        np.mod(phase_state_idx, self._n_bits, out=phase_state_idx)
         return phase_state_idx
     
-    def electrode_map(self, phase_state_idx):
+    def quantize_u8(self, phase_map):
+        """Quantize 8-bit encoded phase data into a fixed number of phase states, see `process_phase_map_u8`.
+
+        Args:
+            phase_map (ndarray): Uint8 array of phase data, where 0 maps to the start of `phase_range` and 255 maps to its end (e.g. value / 255 * 2pi).
+
+        Raises:
+            TIPLMException: Phase map is not uint8
+
+        Returns:
+            ndarray: Array containing phase state index values corresponding to each input value. Same as `quantize` on the equivalent floating point phase data.
+        """
+        phase_map = np.asarray(phase_map)
+        if phase_map.dtype != np.uint8:
+            raise TIPLMException(f'8-bit phase map must have dtype uint8, got {phase_map.dtype}.')
+        return np.take(self._u8_state_lut, phase_map)
+    
+    def electrode_map(self, phase_state_idx, replicate_bits=False, out=None):
         """Convert phase state index to electrode layout array based on the current device's memory map and electrode map layout.
 
         Args:
             phase_state_idx (ndarray): Array of phase state index values. Must be at least 2D. If >2D, last 2 dimensions will be treated as PLM row and column. E.g. if operating on data for multiple channels, dimensions should be channel, row, column. Supports prepending arbitrary dimensions as long as last 2 are row and column.
+            replicate_bits (bool, optional): Whether or not to replicate each bit across all 8 bits of the output (0 or 255). This is free since it is precomputed in the electrode lookup table. Defaults to False.
+            out (ndarray, optional): C-contiguous uint8 array to write the output into, e.g. to reuse the same buffer across calls. Must have the shape of the output. Defaults to None, in which case a new array is allocated.
+
+        Raises:
+            TIPLMException: Incorrect `out` array, or `memory_lut` is empty
 
         Returns:
             ndarray: Uint8 array of binary encoded phase index values. Output dimensions will be a function of the electrode layout. E.g. if 2x2 electrode layout is used, the last 2 output dimensions will be 2x rows and columns of input.
         """
+        phase_state_idx = np.asarray(phase_state_idx)
+        return self._electrode_map(phase_state_idx, self._bit_lut_x255_packed if replicate_bits else self._bit_lut_packed, out)
+    
+    def _electrode_map(self, phase_state_idx, bit_lut, out=None):
+        """Map phase state index values to electrode bits using one of the cached (packed) electrode bit lookup tables."""
         
-        # index into `memory_lut` using `phase_state_idx` array. resulting `memory` array will have same shape as `phase_state_idx`.
-        memory = self.memory_lut[phase_state_idx]
+        out = self._output_buffer(phase_state_idx.shape, out)
         
-        # broadcast `memory` and `electrode_layout` with bitwise_right_shift so all elements of `memory` are shifted by all values in `electrode_layout`
-        # resulting array will have 2 additional dimensions added to the end representing the 2 dimensions of electrode_layout
-        # at the same time, use `& 1` to mask everything except LSB
-        out = np.bitwise_right_shift(memory[..., None, None], self.electrode_layout.astype(np.uint8)).astype(np.uint8) & 1
+        # reverse order of phase state index values along axes indicated in `data_flip` parameter. electrode blocks in `bit_lut` are already flipped, so the output comes out flipped.
+        # this is a view of the (small) index array, so unlike flipping the output no data is copied
+        phase_state_idx = phase_state_idx[..., ::-1 if self.data_flip[0] else 1, ::-1 if self.data_flip[1] else 1]
         
-        # calculate new shape of final output by multiplying the last 2 dimensions by the shape of electrode_layout
-        new_shape = np.concat([np.array(memory.shape)[:-2], np.multiply(memory.shape[-2:], self.electrode_layout.shape)])
+        # `take` needs intp indices. convert once here instead of letting `take` convert the index array again for each electrode row.
+        phase_state_idx = np.asarray(phase_state_idx, dtype=np.intp)
         
-        # rearrange array axes so when we call reshape we end up with groups of NxM bits in the order defined by electrode_layout array
-        out = np.swapaxes(out, -2, -3).reshape(new_shape)
+        # view output with dimensions (..., row, electrode row, column, packed electrode columns), which is the same memory order as the final output
+        # this way the gathered data lands in its final position and no swapaxes copy is needed
+        n_rows = bit_lut.shape[0]
+        words = out.reshape(phase_state_idx.shape[:-1] + (n_rows,) + phase_state_idx.shape[-1:] + self._bit_lut.shape[2:]).view(bit_lut.dtype)
         
-        # flip array along axes indicated in `data_flip` parameter
-        # `flip` function calls for dimension indices, so we need to create an array of index values corresponding to all dimensions that are True in data_flip
-        # use reverse indexing starting from -2 to only operate on last 2 dimensions (row, column)
-        out = np.flip(out, [-2 + idx for idx, flip in enumerate(self.data_flip) if flip])
+        # index into `bit_lut` using `phase_state_idx` array once for each electrode row. this replaces the memory lookup, bit shift, and mask with a gather.
+        for row in range(n_rows):
+            words[..., row, :, :] = np.take(bit_lut[row], phase_state_idx, axis=0)
         
         return out
+    
+    def _output_buffer(self, shape, out=None, channels_last=False):
+        """Get output array for electrode mapped data given the (phase map) input shape, allocating a new one if `out` is None.
+        
+        If `channels_last` is True, the output has the channel dimension (third to last dimension of `shape`) moved to the end.
+        """
+        
+        # every electrode mapping operation gets its output buffer here first, so check the lookup tables exist once here
+        if self._bit_lut is None:
+            raise TIPLMException('`memory_lut` array must not be empty for electrode mapping')
+        
+        # calculate shape of output by multiplying the last 2 dimensions by the shape of electrode_layout
+        # use plain tuples since this runs on every call
+        bh, bw = self._bit_lut.shape[1:]
+        new_shape = tuple(shape[:-2]) + (shape[-2] * bh, shape[-1] * bw)
+        if channels_last:
+            new_shape = new_shape[:-3] + new_shape[-2:] + new_shape[-3:-2]
+        
+        if out is None:
+            return np.empty(new_shape, dtype=np.uint8)
+        if not isinstance(out, np.ndarray) or out.dtype != np.uint8 or not out.flags.c_contiguous or out.shape != new_shape:
+            raise TIPLMException(f'`out` must be a C-contiguous uint8 array of shape {new_shape}.')
+        return out
 
-    def process_phase_map(self, phase_map, replicate_bits=True, enforce_shape=True):
+    def process_phase_map(self, phase_map, replicate_bits=True, enforce_shape=True, out=None, channels_last=False):
         """Process an array of phase data into a bitmap appropriate for displaying on this PLM device. This function handles quantization and electrode mapping of data.
 
         Args:
-            phase_map (ndarray): Array containing phase data in the range [0, 2pi). Array can have 3 or more dimensions (e.g. channel, row, column).
+            phase_map (ndarray): Array containing phase data in the range [0, 2pi). Array can have 3 or more dimensions (e.g. channel, row, column). Phase data is processed as float32, see `quantize`.
             replicate_bits (bool, optional): Whether or not to multiply the final bitplane by 255 (0b11111111) so that the same CGH will be displayed for the full frame time. Defaults to True.
             enforce_shape (bool, optional): Whether or not to make sure the input phase map has the correct resolution. Defaults to True.
+            out (ndarray, optional): C-contiguous uint8 array to write the output into. Reusing the same buffer across calls (e.g. when streaming video-rate CGHs) avoids allocating a new output for every frame. Defaults to None, in which case a new array is allocated.
+            channels_last (bool, optional): Whether or not the last dimension of `phase_map` is the channel dimension, e.g. (row, column, channel) as used by PIL for RGB images. The output will have the same layout. This avoids transposing data into and out of (channel, row, column) order. With `numba` installed the data is processed in place without any copies. Defaults to False.
 
         Raises:
-            TIPLMException: Incorrect phase map resolution
+            TIPLMException: Incorrect phase map resolution or `out` array, or `memory_lut` is empty
 
         Returns:
-            ndarray: Quantized and electrode mapped data based on the provided phase map, optionally replicated across all bits to fill the full frame time with the same CGH.
+            ndarray: Quantized and electrode mapped data based on the provided phase map, optionally replicated across all bits to fill the full frame time with the same CGH. This is `out` if it was provided.
         """
+        return self._process_phase_map(phase_map, replicate_bits, enforce_shape, out, channels_last, u8=False)
+
+    def process_phase_map_u8(self, phase_map, replicate_bits=True, enforce_shape=True, out=None, channels_last=False):
+        """Process an array of 8-bit encoded phase data into a bitmap appropriate for displaying on this PLM device.
+
+        This is the same as calling `process_phase_map` on `phase_map / 255 * 2*pi` (or more generally, 0 to 255 scaled to `phase_range`), but works on the uint8 data directly, which is the usual format of phase data loaded from image files. There are only 256 possible input values, so the phase state and electrode bits of each are precomputed and every pixel is a single table lookup. No floating point phase map is created, and input data is 4x smaller than float32.
+
+        Args:
+            phase_map (ndarray): Uint8 array of phase data, where 0 maps to the start of `phase_range` and 255 maps to its end. Array can have 3 or more dimensions (e.g. channel, row, column).
+            replicate_bits (bool, optional): See `process_phase_map`. Defaults to True.
+            enforce_shape (bool, optional): See `process_phase_map`. Defaults to True.
+            out (ndarray, optional): See `process_phase_map`. Defaults to None.
+            channels_last (bool, optional): See `process_phase_map`. Defaults to False.
+
+        Raises:
+            TIPLMException: Phase map is not uint8, incorrect phase map resolution or `out` array, or `memory_lut` is empty
+
+        Returns:
+            ndarray: Quantized and electrode mapped data based on the provided phase map. This is `out` if it was provided.
+        """
+        phase_map = np.asarray(phase_map)
+        if phase_map.dtype != np.uint8:
+            raise TIPLMException(f'8-bit phase map must have dtype uint8, got {phase_map.dtype}.')
+        return self._process_phase_map(phase_map, replicate_bits, enforce_shape, out, channels_last, u8=True)
+
+    def _process_phase_map(self, phase_map, replicate_bits, enforce_shape, out, channels_last, u8):
+        """Shared implementation of `process_phase_map` and `process_phase_map_u8`."""
+        if channels_last:
+            if phase_map.ndim < 3:
+                raise TIPLMException(f'Phase map with channels last must have at least 3 dimensions, got shape {phase_map.shape}.')
+            # view phase map with channel dimension in front of row and column dimensions. no data is copied.
+            phase_map = np.moveaxis(phase_map, -1, -3)
+        
         if enforce_shape and (len(phase_map.shape) < 2 or phase_map.shape[-2] != self.shape[0] or phase_map.shape[-1] != self.shape[1]):
             raise TIPLMException(f'Phase map shape ({phase_map.shape}) does not match device shape ({self.shape}).')
         
-        out = self.electrode_map(self.quantize(phase_map))
+        # process data into a (channel, row, column) view of the output so it matches the phase map
+        out = self._output_buffer(phase_map.shape, out, channels_last)
+        out_view = np.moveaxis(out, -1, -3) if channels_last else out
         
-        if replicate_bits:
-            out *= 255
+        # use fused compiled kernel if numba is available
+        # bit replication is baked into a second lookup table, so no extra pass over the output is needed
+        # 8-bit data indexes its (precomputed) electrode bits directly, so there are no buckets to search
+        fastkernel = _get_fastkernel()
+        if fastkernel is not None and phase_map.ndim >= 2:
+            if u8:
+                bit_lut = self._u8_bit_lut_x255 if replicate_bits else self._u8_bit_lut
+                fastkernel.process_phase_map(phase_map, None, bit_lut, self.data_flip, out_view)
+            else:
+                bit_lut = self._bit_lut_x255 if replicate_bits else self._bit_lut
+                fastkernel.process_phase_map(phase_map, self._phase_buckets, bit_lut, self.data_flip, out_view)
+            return out
+        
+        if u8:
+            phase_state_idx = phase_map
+            bit_lut = self._u8_bit_lut_x255_packed if replicate_bits else self._u8_bit_lut_packed
+        else:
+            phase_state_idx = self.quantize(phase_map)
+            bit_lut = self._bit_lut_x255_packed if replicate_bits else self._bit_lut_packed
+        
+        if channels_last:
+            # NumPy implementation needs a contiguous output, so copy data into channels last layout at the end
+            out_view[...] = self._electrode_map(phase_state_idx, bit_lut)
+        else:
+            self._electrode_map(phase_state_idx, bit_lut, out)
         
         return out
 
@@ -196,7 +476,7 @@ class PLM(param.Parameterized):
         from .db import get_db, get_device_list
         db = get_db()
         if catalog in db:
-            db_params = cls.param.deserialize_parameters(db[catalog])  # get dict of params deserialized from json string
+            db_params = _deserialize_db_params(cls, catalog)  # get (memoized) dict of params deserialized from json string
             obj = cls(**db_params | params)  # create new PLM object with param values
             for p in db_params.keys():
                 obj.param[p].constant = True  # set db params to constant
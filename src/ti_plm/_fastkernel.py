@@ -0,0 +1,198 @@
+"""
+Optional compiled kernels used to accelerate phase map processing. This module requires `numba` to be installed and will
+raise ImportError otherwise, in which case the PLM class falls back to its pure NumPy implementation.
+"""
+
+from functools import cache
+import numpy as np
+from numba import njit, prange
+
+
+@njit(inline='always', boundscheck=False)
+def _search(x, buckets):
+    """Return phase state index of `x`, i.e. np.searchsorted(buckets, x, side='right') wrapped to the number of buckets."""
+    lo = 0
+    hi = buckets.shape[0]
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        if x >= buckets[mid]:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo % buckets.shape[0]
+
+
+@njit(inline='always', boundscheck=False)
+def _search16(x, buckets):
+    """Branchless equivalent of `_search` for exactly 16 buckets.
+
+    The 4 halving steps always execute, so there are no data dependent branches to mispredict on high entropy phase
+    data. The final compare against the top bucket produces index 16, which wraps to 0 like the generic search.
+    """
+    idx = 8 * (x >= buckets[7])
+    idx += 4 * (x >= buckets[idx + 3])
+    idx += 2 * (x >= buckets[idx + 1])
+    idx += x >= buckets[idx]
+    return (idx + (x >= buckets[15])) & 15
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def _quantize16(phase_map, buckets, out):
+    """Quantize a flat float32 phase array into 16 phase states using the branchless search."""
+    for k in prange(phase_map.shape[0]):
+        out[k] = _search16(phase_map[k], buckets)
+
+
+# placeholder passed to kernels that index `bit_lut` directly, so the `buckets` argument always has the same type
+_NO_BUCKETS = np.empty(0, dtype=np.float32)
+
+
+@cache
+def _process_kernel(n_buckets, bh, bw):
+    """Get fused quantize and electrode map kernel compiled for a specific device configuration.
+
+    The number of phase buckets and the electrode block shape are closure variables, which numba treats as compile
+    time constants. This picks the search at compile time and fully unrolls the electrode block loops. Kernels are
+    cached in memory per configuration, and numba caches each one on disk since the closure variables are part of
+    its cache key.
+
+    Args:
+        n_buckets (int): Number of phase buckets. If 0, the phase map holds `bit_lut` indices directly and no search is done.
+        bh (int): Number of electrode rows under each mirror.
+        bw (int): Number of electrode columns under each mirror.
+
+    Returns:
+        function: Compiled kernel
+    """
+    use_direct = n_buckets == 0
+    use_search16 = n_buckets == 16
+
+    @njit(cache=True, parallel=True, boundscheck=False)
+    def _process(phase_map, buckets, bit_lut, out):
+        """Fused quantize and electrode map kernel.
+
+        Each phase value is read once, binary searched into `buckets`, and the matching electrode bit block from
+        `bit_lut` is written directly to its final location in `out`, so no intermediate arrays are created.
+
+        Args:
+            phase_map (ndarray): 4D float32 array of phase data, or uint8 array of `bit_lut` indices if `n_buckets` is 0 (stack, channel, row, column). May be strided.
+            buckets (ndarray): Sorted float32 phase bucket edges. Unused if `n_buckets` is 0.
+            bit_lut (ndarray): 3D uint8 electrode bit lookup table (phase state, electrode row, electrode column).
+            out (ndarray): 4D uint8 output array (stack, channel, row * electrode rows, column * electrode columns). May be a strided view, e.g. with negative strides or channels last.
+        """
+        n, channels, rows, cols = phase_map.shape
+        for k in prange(n * channels * rows):
+            i = k // (channels * rows)
+            ch = (k // rows) % channels
+            r = k % rows
+            for c in range(cols):
+                if use_direct:
+                    idx = phase_map[i, ch, r, c]
+                elif use_search16:
+                    idx = _search16(phase_map[i, ch, r, c], buckets)
+                else:
+                    idx = _search(phase_map[i, ch, r, c], buckets)
+
+                for bi in range(bh):
+                    for bj in range(bw):
+                        out[i, ch, r * bh + bi, c * bw + bj] = bit_lut[idx, bi, bj]
+
+    return _process
+
+
+def _as_4d(a):
+    """Reshape array to 4D (stack, channel, row, column) for the fused kernel.
+
+    Only dimensions in front of the channel dimension are merged, since the channel dimension may be strided (e.g. a
+    channels last array viewed as channels first). This way the result is a view of `a` as long as the leading
+    dimensions are contiguous.
+    """
+    return a.reshape((-1,) + (a.shape[-3:] if a.ndim >= 3 else (1,) + a.shape))
+
+
+def quantize16(phase_map, buckets):
+    """Quantize phase data into 16 phase states. See [ti_plm.PLM.quantize][].
+
+    Args:
+        phase_map (ndarray): Phase data of any shape.
+        buckets (ndarray): Sorted float32 array of exactly 16 phase bucket edges.
+
+    Returns:
+        ndarray: Uint8 array of phase state index values with the same shape as `phase_map`.
+    """
+    phase_map = np.asarray(phase_map, dtype=np.float32, order='C')
+    out = np.empty(phase_map.shape, dtype=np.uint8)
+    _quantize16(phase_map.reshape(-1), buckets, out.reshape(-1))
+    return out
+
+
+def process_phase_map(phase_map, buckets, bit_lut, data_flip, out):
+    """Quantize and electrode map a phase map in a single pass. See [ti_plm.PLM.process_phase_map][].
+
+    Args:
+        phase_map (ndarray): Phase data with at least 2 dimensions, last 2 being row and column. May be strided, e.g. a channels last array viewed as channels first.
+        buckets (ndarray): Sorted float32 phase bucket edges. If None, `phase_map` must be a uint8 array of `bit_lut` indices, e.g. 8-bit phase data with a 256 entry `bit_lut`.
+        bit_lut (ndarray): 3D uint8 electrode bit lookup table (phase state, electrode row, electrode column).
+        data_flip (tuple): 2-tuple indicating whether to flip output data along the row and column dimensions.
+        out (ndarray): Uint8 output array with the last 2 dimensions scaled by the electrode block shape. Either C-contiguous or a channels last C-contiguous array viewed as channels first.
+
+    Returns:
+        ndarray: `out` array filled with electrode mapped data.
+    """
+    # nothing to do for empty data (e.g. an empty stack of frames), which also can't be reshaped to 4D with an inferred leading dimension
+    if phase_map.size == 0:
+        return out
+    
+    # the kernel reads strided data directly, so only convert the data type (if needed) and keep the memory layout
+    if buckets is None:
+        n_buckets = 0
+        buckets = _NO_BUCKETS
+    else:
+        n_buckets = buckets.shape[0]
+        phase_map = np.asarray(phase_map, dtype=np.float32)
+
+    # the kernel writes through a reversed view of the output to apply `data_flip` without an extra copy
+    view = _as_4d(out)[:, :, ::-1 if data_flip[0] else 1, ::-1 if data_flip[1] else 1]
+    _process_kernel(n_buckets, *bit_lut.shape[1:])(_as_4d(phase_map), buckets, bit_lut, view)
+    return out
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def _bitpack(bitmaps, out):
+    """Pack LSB of each group of 8 bitmaps into the bits of one output channel.
+
+    Bitmaps are processed as uint64 words, so each operation handles 8 pixels at once (SWAR). Masking each byte to its
+    LSB before shifting keeps every bit inside its own pixel byte, so no bit transpose is needed.
+
+    Args:
+        bitmaps (tuple): 8 or 24 flat uint8 bitmaps viewed as uint64 words.
+        out (ndarray): 2D uint64 output array (channel, word).
+    """
+    lsb_mask = np.uint64(0x0101010101010101)
+    channels, n = out.shape
+    for c in range(channels):
+        for i in prange(n):
+            word = np.uint64(0)
+            for bit in range(8):
+                word |= (bitmaps[8 * c + bit][i] & lsb_mask) << np.uint64(bit)
+            out[c, i] = word
+
+
+def bitpack(bitmaps):
+    """Stack LSB of groups of 8 bitmaps into 8-bit images. See [ti_plm.util.bitpack][].
+
+    Args:
+        bitmaps (iterable): 8 or 24 bitmaps of the same shape. Number of pixels in each bitmap must be a multiple of 8.
+
+    Returns:
+        ndarray: 3D uint8 array (channel, row, column).
+    """
+    words = tuple(np.ascontiguousarray(bitmap, dtype=np.uint8).reshape(-1).view(np.uint64) for bitmap in bitmaps)
+    
+    # numba types read-only and writable arrays differently, so a mix of both (e.g. read-only arrays from PIL images) can't be indexed as one tuple
+    # mark every word view read-only (the bitmaps themselves are unaffected) so they all have the same type
+    for w in words:
+        w.flags.writeable = False
+    out = np.empty((len(words) // 8, words[0].size), dtype=np.uint64)
+    _bitpack(words, out)
+    return out.view(np.uint8).reshape(out.shape[:1] + np.shape(bitmaps[0]))
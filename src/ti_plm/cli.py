@@ -29,6 +29,11 @@ def cli():
         action='store_true',
         help='Scan path recursively for image files'
     )
+    display_parser.add_argument(
+        '--preload', '-p',
+        action='store_true',
+        help='Decode all images before displaying them so switching between images is faster. Uses more memory.'
+    )
     display_parser.add_argument(
         '--monitor', '-m',
         type=int,
@@ -44,6 +49,6 @@ def display(args):
     from .display import ImageWindow, TIPLMDisplayException
     try:
         with ImageWindow(fullscreen=True, monitor=args.monitor) as win:
-            win.load(args.path, args.recursive).run()
+            win.load(args.path, args.recursive, args.preload).run()
     except TIPLMDisplayException as e:
         print('Error:', e)
@@ -5,6 +5,7 @@ make sure you have installed the latest version in your python environment.
 
 import os
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
 import pathlib
 import logging
@@ -175,13 +176,14 @@ class ImageWindow(Window):
         self._imgs = []
         super().__init__(**params)
     
-    def load(self, img: str | pathlib.Path | Image | pg.Surface, recursive: bool = False):
+    def load(self, img: str | pathlib.Path | Image | pg.Surface, recursive: bool = False, preload: bool = False):
         """Load an image or series of images for displaying in this window. Image are appended to the 
         current list of images. Call .clear() to remove all images from the list.
 
         Args:
             img (str | pathlib.Path | Image | pg.Surface): Input image path, glob string, PIL Image, or pygame Surface
             recursive (bool, optional): Whether or not recursive globing is used on input glob string. Defaults to False.
+            preload (bool, optional): Whether or not to decode all image files up front instead of when each image is displayed. Files are decoded in parallel threads, and switching between images is faster afterwards at the cost of keeping all images in memory. Defaults to False.
 
         Raises:
             TIPLMDisplayException: Error loading requested image(s)
@@ -192,7 +194,19 @@ class ImageWindow(Window):
                 paths = list((p.rglob if recursive else p.glob)('*'))
             else:
                 paths = [pathlib.Path(p) for p in glob(str(img), recursive=recursive)]
-            self._imgs.extend([p for p in paths if p.suffix.lower() in IMAGE_EXTENSIONS])
+            paths = [p for p in paths if p.suffix.lower() in IMAGE_EXTENSIONS]
+            if preload:
+                # image decoding releases the GIL, so threads decode files in parallel and overlap decoding with disk I/O
+                # `map` returns surfaces in the same order as `paths`
+                # collect all surfaces first so a file that fails to decode doesn't leave a partial list of images behind
+                try:
+                    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+                        surfaces = list(ex.map(pg.image.load, paths))
+                except (pg.error, OSError) as e:
+                    raise TIPLMDisplayException(f'Error loading image: {e}') from e
+                self._imgs.extend(surfaces)
+            else:
+                self._imgs.extend(paths)
             if len(self._imgs) == 0:
                 raise TIPLMDisplayException(f'No images found for input path "{img}"')
         elif isinstance(img, Image):
@@ -1,6 +1,7 @@
 """
 Utility module containing objects shared by all other modules in this library.
 """
+from functools import cache
 import numpy as np
 
 TWO_PI = 2 * np.pi
@@ -10,6 +11,19 @@ class TIPLMException(Exception):
     pass
 
 
+@cache
+def _get_fastkernel():
+    """Get the optional numba accelerated kernels module, or None if numba is not installed.
+    
+    Importing numba is slow, so this is deferred until the first operation that can use the kernels instead of happening on `import ti_plm`.
+    """
+    try:
+        from . import _fastkernel
+    except ImportError:
+        return None
+    return _fastkernel
+
+
 def bitpack(bitmaps: list|tuple):
     """Stack MSB of 8 bitmaps into 8-bit image
     
@@ -17,21 +31,28 @@ def bitpack(bitmaps: list|tuple):
         bitmaps (iterable): List of bitmaps to stack. Only the MSB in each bitmap will be used in the final stack. Each bitmap should be a uint8 array of the same shape.
     
     Raises:
-        TIPLMException: Incorrect number of bitmaps provided
+        TIPLMException: Incorrect number of bitmaps provided, or bitmaps have different shapes
     
     Returns:
         ndarray: Uint8 array with the MSB from each of the provided bitmaps stacked along the 8 bits of the output.
     """
-    if len(bitmaps) == 8:
-        stacked = np.stack(bitmaps) & 1  # stack bitmaps and isolate MSB
-        shifted = np.bitwise_left_shift(stacked, np.arange(8)[..., None, None])  # left shift each layer of the stack by 0-8 bits (using tensor broadcasting)
-        return np.sum(shifted, axis=0)[None, ...]  # sum along stacked dimension and insert an extra dimension to the front so output is 3D (channel, row, column)
-    elif len(bitmaps) == 24:
-        rgb = []
-        for n in range(3):
-            stacked = np.stack(bitmaps[n:n+8]) & 1
-            shifted = np.bitwise_left_shift(stacked, np.arange(8)[..., None, None])
-            rgb.append(np.sum(shifted, axis=0))
-        return np.stack(rgb)
-    else:
+    if len(bitmaps) not in (8, 24):
         raise TIPLMException('Bitstack operation only support input bitmap list of length 8 or 24 corresponding to 1 or 3 channel output image, respectively.')
+    
+    # both implementations size the output from the first bitmap, so the others must match it exactly
+    shape = np.shape(bitmaps[0])
+    if any(np.shape(bitmap) != shape for bitmap in bitmaps):
+        raise TIPLMException(f'All bitmaps must have the same shape, got {[np.shape(bitmap) for bitmap in bitmaps]}.')
+    
+    # use compiled kernel if numba is available. it packs 8 pixels at a time as uint64 words, so bitmap size must be a multiple of 8.
+    fastkernel = _get_fastkernel()
+    if fastkernel is not None and np.size(bitmaps[0]) % 8 == 0:
+        return fastkernel.bitpack(bitmaps)
+    
+    # each group of 8 bitmaps forms one output channel, with the first bitmap of each group in the LSB
+    # note: np.packbits on the stacked bitmaps gives the same result but is much slower, since the bitmaps need to be stacked along a new bit axis first
+    out = np.zeros((len(bitmaps) // 8,) + shape, dtype=np.uint8)
+    for n in range(out.shape[0]):
+        for bit in range(8):
+            out[n] |= (np.asarray(bitmaps[8 * n + bit], dtype=np.uint8) & 1) << bit
+    return out
@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.fixture(params=['fast', 'numpy'])
+def implementation(request, monkeypatch):
+    """Run a test once with the compiled numba kernels and once with the pure NumPy implementation.
+    
+    The compiled case is skipped if ti_plm was installed without the `fast` extra.
+    """
+    import ti_plm
+    from ti_plm import util
+    
+    if request.param == 'fast':
+        if util._get_fastkernel() is None:
+            pytest.skip('ti_plm installed without `fast` extra (numba)')
+    else:
+        monkeypatch.setattr(ti_plm, '_get_fastkernel', lambda: None)
+        monkeypatch.setattr(util, '_get_fastkernel', lambda: None)
+    return request.param
@@ -23,3 +23,38 @@ def test_bitpack():
         stack = f(bitmaps)
         assert np.array_equal(stack.shape, np.array([3, n, n]))
         assert np.all(stack == 255)
+
+
+def test_bitpack_channels(implementation):
+    from ti_plm import util
+    
+    # use a different random bitmap for each bit so channel grouping and bit order are checked
+    rng = np.random.default_rng(0)
+    bitmaps = [rng.integers(0, 2, (16, 24), dtype=np.uint8) * 255 for _ in range(24)]
+    expected = np.stack([
+        sum((bitmaps[8 * n + bit].astype(np.int64) & 1) << bit for bit in range(8))
+        for n in range(3)
+    ])
+    
+    stack = util.bitpack(bitmaps)
+    assert stack.dtype == np.uint8
+    assert np.array_equal(stack, expected)
+    assert np.array_equal(util.bitpack(bitmaps[8:16]), expected[1:2])
+    
+    # mix of read-only (e.g. np.asarray of a PIL image) and writable bitmaps
+    bitmaps[0].flags.writeable = False
+    bitmaps[9].flags.writeable = False
+    assert np.array_equal(util.bitpack(bitmaps), expected)
+    assert np.array_equal(util.bitpack(bitmaps[8:16]), expected[1:2])
+
+
+def test_bitpack_shape_mismatch(implementation):
+    from pytest import raises
+    from ti_plm import util, TIPLMException
+    
+    bitmaps = [np.ones((8, 8), dtype=np.uint8) for _ in range(8)]
+    
+    # larger first bitmap would read past the end of the others, smaller one would broadcast
+    for first in [np.ones((64, 64), dtype=np.uint8), np.ones((1, 8), dtype=np.uint8)]:
+        with raises(TIPLMException):
+            util.bitpack([first] + bitmaps[1:])
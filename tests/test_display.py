@@ -1,4 +1,5 @@
 import pathlib
+from pytest import raises
 
 here = pathlib.Path(__file__).parent
 
@@ -15,4 +16,23 @@ def test_display():
     
     with ImageWindow() as win:
         win.load(here / '../examples')
-    
\ No newline at end of file
+    
+    with ImageWindow() as win:
+        win.load(here / '../examples', preload=True)
+
+
+def test_display_preload_error(tmp_path):
+    try:
+        from ti_plm.display import ImageWindow, TIPLMDisplayException
+    except ImportError:
+        print('Skipping test_display_preload_error: ti_plm installed without `display` module support')
+        return
+    
+    # one valid image and one file that can't be decoded
+    (tmp_path / 'a.png').write_bytes((here / '../examples/bird_p67_7cm.png').read_bytes())
+    (tmp_path / 'b.png').write_bytes(b'not an image')
+    
+    with ImageWindow() as win:
+        with raises(TIPLMDisplayException):
+            win.load(tmp_path, preload=True)
+        assert len(win._imgs) == 0
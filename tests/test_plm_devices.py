@@ -273,4 +273,226 @@ def test_p67_custom():
     
     # make sure size and area are calculated correctly
     assert np.array_equal(plm.size(), [8640e-6, 13824e-6])
-    assert approx(plm.area()) == 1.1943935e-4
\ No newline at end of file
+    assert approx(plm.area()) == 1.1943935e-4
+
+
+def _reference_process_phase_map(plm, phase, replicate_bits):
+    """Straightforward implementation of quantization and electrode mapping using the original bit shift algorithm."""
+    phase_state_idx = np.digitize(phase.astype(np.float32), plm._phase_buckets) % plm._n_bits
+    memory = plm.memory_lut[phase_state_idx]
+    out = np.bitwise_right_shift(memory[..., None, None], plm.electrode_layout.astype(np.uint8)).astype(np.uint8) & 1
+    new_shape = memory.shape[:-2] + (memory.shape[-2] * plm.electrode_layout.shape[0], memory.shape[-1] * plm.electrode_layout.shape[1])
+    out = np.swapaxes(out, -2, -3).reshape(new_shape)
+    out = np.flip(out, [-2 + idx for idx, flip in enumerate(plm.data_flip) if flip])
+    return out * 255 if replicate_bits else out
+
+
+def test_reference(implementation):
+    from ti_plm import PLM
+    
+    # random phase data including values outside of phase range to exercise wrapping
+    rng = np.random.default_rng(0)
+    phase = rng.uniform(-1, 2 * np.pi + 1, size=(3, 16, 24))
+    
+    # 16 state devices use a specialized search, so also check a hypothetical 8 state device to cover the generic one
+    plms = [PLM.from_db('p67', data_flip=flip) for flip in [(False, False), (True, False), (False, True), (True, True)]]
+    plms.append(PLM(
+        shape=(16, 24),
+        pitch=(1e-5, 1e-5),
+        displacement_ratios=np.array([0.0, 0.05, 0.1, 0.2, 0.35, 0.5, 0.7, 1.0]),
+        memory_lut=np.array([1, 0, 3, 2, 5, 4, 7, 6]),
+        electrode_layout=np.array([[0, 1, 2]]),
+        data_flip=(True, False)
+    ))
+    
+    for plm in plms:
+        assert np.array_equal(plm.quantize(phase), np.digitize(phase.astype(np.float32), plm._phase_buckets) % plm._n_bits)
+        for replicate_bits in [True, False]:
+            expected = _reference_process_phase_map(plm, phase, replicate_bits)
+            assert np.array_equal(plm.process_phase_map(phase, replicate_bits=replicate_bits, enforce_shape=False), expected)
+    
+    # empty data, e.g. an empty stack of frames (which passes the shape check)
+    plm = plms[0]
+    for shape in [(0,) + tuple(plm.shape), (3, 0, 4), (0, 4)]:
+        expected_shape = shape[:-2] + (shape[-2] * 2, shape[-1] * 2)
+        out = plm.process_phase_map(np.zeros(shape), enforce_shape=shape[-2:] == tuple(plm.shape))
+        assert out.shape == expected_shape
+        assert plm.process_phase_map_u8(np.zeros(shape, dtype=np.uint8), enforce_shape=False).shape == expected_shape
+
+
+def test_output_buffer(implementation):
+    from ti_plm import PLM, TIPLMException
+    
+    plm = PLM.from_db('p67')
+    rng = np.random.default_rng(0)
+    phase = rng.uniform(0, 2 * np.pi, size=(2, 16, 24))
+    
+    expected = plm.process_phase_map(phase, enforce_shape=False)
+    
+    # output should be written to and returned as the provided buffer
+    buf = np.zeros((2, 32, 48), dtype=np.uint8)
+    out = plm.process_phase_map(phase, enforce_shape=False, out=buf)
+    assert out is buf
+    assert np.array_equal(buf, expected)
+    
+    # reuse buffer for another frame
+    plm.process_phase_map(phase[::-1], enforce_shape=False, out=buf)
+    assert np.array_equal(buf, expected[::-1])
+    
+    buf = np.zeros((2, 32, 48), dtype=np.uint8)
+    assert plm.electrode_map(plm.quantize(phase), out=buf) is buf
+    assert np.array_equal(buf * 255, expected)
+    assert np.array_equal(plm.electrode_map(plm.quantize(phase), replicate_bits=True), expected)
+    
+    # array-like index values
+    assert np.array_equal(plm.electrode_map(plm.quantize(phase).tolist(), replicate_bits=True), expected)
+    
+    # make sure incorrect buffers are rejected
+    for buf in [np.zeros((2, 32, 47), dtype=np.uint8), np.zeros((2, 32, 48)), np.zeros((2, 32, 96), dtype=np.uint8)[..., ::2]]:
+        with raises(TIPLMException):
+            plm.process_phase_map(phase, enforce_shape=False, out=buf)
+
+
+def test_channels_last(implementation):
+    from ti_plm import PLM, TIPLMException
+    
+    plm = PLM.from_db('p67')
+    rng = np.random.default_rng(0)
+    
+    # e.g. RGB image (row, column, channel) and a time series of RGB images (time, row, column, channel)
+    for shape in [(16, 24, 3), (2, 16, 24, 3)]:
+        phase = rng.uniform(0, 2 * np.pi, size=shape)
+        expected = np.moveaxis(plm.process_phase_map(np.moveaxis(phase, -1, -3), enforce_shape=False), -3, -1)
+        
+        out = plm.process_phase_map(phase, enforce_shape=False, channels_last=True)
+        assert out.flags.c_contiguous
+        assert np.array_equal(out, expected)
+        
+        buf = np.zeros(expected.shape, dtype=np.uint8)
+        assert plm.process_phase_map(phase, enforce_shape=False, out=buf, channels_last=True) is buf
+        assert np.array_equal(buf, expected)
+    
+    with raises(TIPLMException):
+        plm.process_phase_map(np.zeros((16, 24)), enforce_shape=False, channels_last=True)
+
+
+def test_process_phase_map_u8(implementation):
+    from ti_plm import PLM, TIPLMException
+    
+    rng = np.random.default_rng(0)
+    
+    for device in PLM.get_device_list():
+        plm = PLM.from_db(device)
+        
+        # every possible 8-bit value in each channel, followed by random data
+        img = rng.integers(0, 256, size=(3, 16, 32), dtype=np.uint8)
+        img[:, :8] = np.arange(256, dtype=np.uint8).reshape(8, 32)
+        phase = img.astype(np.float32) / 255 * 2 * np.pi
+        
+        assert np.array_equal(plm.quantize_u8(img), plm.quantize(phase))
+        for replicate_bits in [True, False]:
+            expected = plm.process_phase_map(phase, replicate_bits, enforce_shape=False)
+            assert np.array_equal(plm.process_phase_map_u8(img, replicate_bits, enforce_shape=False), expected)
+            
+            out = np.zeros(expected.shape, dtype=np.uint8)
+            assert plm.process_phase_map_u8(img, replicate_bits, enforce_shape=False, out=out) is out
+            assert np.array_equal(out, expected)
+            
+            # channels last
+            out = plm.process_phase_map_u8(np.moveaxis(img, 0, -1), replicate_bits, enforce_shape=False, channels_last=True)
+            assert np.array_equal(out, np.moveaxis(expected, 0, -1))
+    
+    with raises(TIPLMException):
+        plm.process_phase_map_u8(phase, enforce_shape=False)
+
+
+def test_electrode_layout_2d():
+    from ti_plm import PLM, TIPLMException
+    
+    for data_flip in [(False, False), (True, True)]:
+        with raises(TIPLMException):
+            PLM.from_db('p67', electrode_layout=np.array([0, 1, 2, 3]), data_flip=data_flip)
+    
+    # also checked when assigned after construction
+    plm = PLM(
+        shape=(16, 24),
+        pitch=(1e-5, 1e-5),
+        displacement_ratios=np.array([0.0, 0.25, 0.5, 0.75]),
+        memory_lut=np.array([0, 1, 2, 3]),
+        electrode_layout=np.array([[0, 1]]),
+    )
+    with raises(TIPLMException):
+        plm.electrode_layout = np.array([0, 1])
+
+
+def test_quantize_only():
+    from ti_plm import PLM, TIPLMException
+    
+    # memory_lut is only needed for electrode mapping
+    plm = PLM(
+        shape=(16, 24),
+        pitch=(1e-5, 1e-5),
+        displacement_ratios=np.array([0.0, 0.25, 0.5, 0.75]),
+    )
+    phase = np.linspace(0, 2 * np.pi, 16 * 24, endpoint=False, dtype=np.float32).reshape(16, 24)
+    img = np.arange(16 * 24).reshape(16, 24).astype(np.uint8)
+    assert np.array_equal(plm.quantize(phase), np.digitize(phase, plm._phase_buckets) % 4)
+    assert np.array_equal(plm.quantize_u8(img), plm.quantize(img.astype(np.float32) / 255 * 2 * np.pi))
+    
+    for f in [plm.electrode_map, plm.process_phase_map, plm.process_phase_map_u8]:
+        with raises(TIPLMException):
+            f(img)
+
+
+def test_memory_lut_validation():
+    from ti_plm import PLM, TIPLMException
+    
+    params = dict(
+        shape=(16, 24),
+        pitch=(1e-5, 1e-5),
+        displacement_ratios=np.array([0.0, 0.25, 0.5, 0.75]),
+        electrode_layout=np.array([[0, 1]]),
+    )
+    
+    # memory values are stored as given, whether set on init or afterwards
+    memory_lut = np.array([0, 1, 2, 3], dtype=np.int64)
+    plm = PLM(memory_lut=memory_lut, **params)
+    assert plm.memory_lut.dtype == np.int64
+    plm.memory_lut = np.array([3, 2, 1, 0], dtype=np.int64)
+    assert plm.memory_lut.dtype == np.int64
+    
+    # param validation rejects non-arrays, floating point memory values are rejected when building the lookup tables
+    with raises(ValueError):
+        PLM(memory_lut=[0, 1, 2, 3], **params)
+    with raises(TIPLMException):
+        PLM(memory_lut=np.array([0, 1, 2, 4097.0]), **params)
+
+
+def test_from_db_cache():
+    from ti_plm import PLM
+    from ti_plm.db import get_db
+    
+    db_params = PLM.param.deserialize_parameters(get_db()['p67'])
+    
+    # overrides apply to the new object only and must not leak into the (memoized) deserialized params shared by later calls
+    displacement_ratios = np.linspace(0, 1, 16)
+    custom = PLM.from_db('p67', displacement_ratios=displacement_ratios)
+    plm = PLM.from_db('p67')
+    assert np.array_equal(custom.displacement_ratios, displacement_ratios)
+    assert np.array_equal(plm.displacement_ratios, db_params['displacement_ratios'])
+    assert not np.array_equal(plm.displacement_ratios, displacement_ratios)
+    
+    # db params are still constant on each object
+    for obj in [custom, plm]:
+        with raises(TypeError):
+            obj.shape = (1, 1)
+        with raises(TypeError):
+            obj.memory_lut = np.arange(16)
+    
+    # arrays shared between objects are read-only
+    assert plm.memory_lut is PLM.from_db('p67').memory_lut
+    for name, value in db_params.items():
+        if isinstance(value, np.ndarray):
+            assert not getattr(plm, name).flags.writeable
+    with raises(ValueError):
+        plm.memory_lut[0] = 1